@@ -1,76 +1,101 @@
 from __future__ import annotations
 
-import html
+import os
+from functools import lru_cache
 from pathlib import Path
 
 
 DIST_DIR = Path("dist")
 OUTPUT_FILE = Path("home.html")
 
+# Path properties allocate on every evaluation; hoist the default's root name.
+_DIST_ROOT_NAME = DIST_DIR.name
 
-def discover_city_pages(dist_dir: Path = DIST_DIR) -> list[tuple[str, str]]:
-    """Return [(label, relative_path)] for each city HTML page under dist."""
-    if not dist_dir.exists():
-        return []
 
-    discovered: dict[str, Path] = {}
+def _scandir_html(path: Path | str, rel_prefix: str, parent_name: str):
+    """Yield (file name, parent dir name, relative POSIX path) per .html file.
+
+    The relative path and parent name are threaded through the recursion as
+    plain strings, so consumers never touch pathlib in the hot loop.
+    """
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scandir_html(entry.path, f"{rel_prefix}/{entry.name}", entry.name)
+            elif entry.is_file(follow_symlinks=False) and entry.name.endswith(".html"):
+                yield entry.name, parent_name, f"{rel_prefix}/{entry.name}"
 
-    for path in sorted(dist_dir.rglob("*.html")):
-        # Skip the statewide index page
-        if path == dist_dir / "index.html":
-            continue
 
-        # Skip loose HTML files at the root (we prefer the city folders)
-        if path.parent == dist_dir and path.name != "index.html":
-            continue
+def _iter_city_html(dist_dir: Path | str, rel_root: str):
+    """Yield (name, parent name, relative path) from dist's subdirectories.
 
-        if path.name == "index.html":
-            slug = path.parent.name
-        else:
-            slug = path.stem
+    The statewide index.html and any loose HTML files at the top level are
+    excluded structurally: the root scan only recurses into directories.
+    """
+    with os.scandir(dist_dir) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scandir_html(entry.path, f"{rel_root}/{entry.name}", entry.name)
 
-        label = slug_to_label(slug)
-        # Prefer nested city directories over single files if duplicates appear
-        if label not in discovered or path.name == "index.html":
-            discovered[label] = path
 
-    return [(label, rel_path(dist_dir.parent, p)) for label, p in sorted(discovered.items())]
+def discover_city_pages(dist_dir: Path = DIST_DIR) -> list[tuple[str, str]]:
+    """Return [(label, relative_path)] for each city HTML page under dist."""
+    discovered: dict[str, tuple[int, str]] = {}
+    rel_root = _DIST_ROOT_NAME if dist_dir is DIST_DIR else dist_dir.name
+
+    try:
+        for name, parent_name, rel in _iter_city_html(dist_dir, rel_root):
+            # Prefer nested city directories over single files if duplicates
+            # appear: index.html gets priority 0, anything else 1.
+            if name == "index.html":
+                slug = parent_name
+                priority = 0
+            else:
+                slug = name[:-5]  # strip ".html"
+                priority = 1
+
+            label = slug_to_label(slug)
+            current = discovered.get(label)
+            if current is None or priority < current[0]:
+                discovered[label] = (priority, rel)
+    except FileNotFoundError:
+        # No dist directory (or it vanished mid-scan): no city pages.
+        return []
+
+    return [(label, rel) for label, (_, rel) in sorted(discovered.items())]
 
 
+@lru_cache(maxsize=1024)
 def slug_to_label(slug: str) -> str:
     """Convert a slug like 'chapel-hill-nc' into 'Chapel Hill, NC'."""
+    # Single pass over each hyphen-separated part; slugs are ASCII, so
+    # capitalizing the first character matches str.title() without its rescan.
     parts = slug.split("-")
-    if parts and parts[-1].lower() == "nc":
-        city = " ".join(parts[:-1]) or "NC"
-        return f"{city.title()}, NC"
-    return slug.replace("-", " ").title()
+    if parts[-1] in ("nc", "NC", "Nc"):
+        parts = parts[:-1] or ["NC"]
+        suffix = ", NC"
+    else:
+        suffix = ""
+    return " ".join(p[:1].upper() + p[1:] for p in parts) + suffix
 
 
 def rel_path(base: Path, target: Path) -> str:
     """Return POSIX-style relative path from base directory to target."""
-    return target.relative_to(base).as_posix()
+    target_str = target.as_posix()
+    prefix = base.as_posix() + "/"
+    return target_str[len(prefix):] if target_str.startswith(prefix) else target_str
 
 
-def build_home_html(city_pages: list[tuple[str, str]]) -> str:
-    """Produce the home page HTML string."""
-    options_html = "\n".join(
-        f'          <option value="{html.escape(path)}">{html.escape(label)}</option>'
-        for label, path in city_pages
-    )
-
-    if not options_html:
-        options_html = '          <option value="" disabled>No city pages found</option>'
-
-    return f"""<!DOCTYPE html>
-<html lang=\"en\">
+_HTML_PREFIX = """<!DOCTYPE html>
+<html lang="en">
 <head>
-  <meta charset=\"utf-8\" />
-  <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
+  <meta charset="utf-8" />
+  <meta name="viewport" content="width=device-width, initial-scale=1" />
   <title>North Carolina Careers Hub</title>
   <style>
-    :root {{
+    :root {
       color-scheme: light;
-      font-family: \"Segoe UI\", system-ui, -apple-system, sans-serif;
+      font-family: "Segoe UI", system-ui, -apple-system, sans-serif;
       line-height: 1.6;
       --bg: #f5f7fb;
       --text: #1f2933;
@@ -80,102 +105,102 @@ def build_home_html(city_pages: list[tuple[str, str]]) -> str:
       --card: #ffffff;
       --shadow: 0 18px 45px rgba(15, 31, 62, 0.12);
       --radius: 18px;
-    }}
+    }
 
-    *, *::before, *::after {{
+    *, *::before, *::after {
       box-sizing: border-box;
-    }}
+    }
 
-    body {{
+    body {
       margin: 0;
       min-height: 100vh;
       background: var(--bg);
       color: var(--text);
       display: flex;
       flex-direction: column;
-    }}
+    }
 
-    header {{
+    header {
       background: linear-gradient(145deg, #102b5d, #15407c, #2463eb);
       color: #fff;
       padding: 3.5rem 1.5rem 3rem;
       text-align: center;
-    }}
+    }
 
-    header h1 {{
+    header h1 {
       margin: 0;
       font-size: clamp(2.2rem, 3vw + 1.2rem, 3.2rem);
       letter-spacing: -0.015em;
-    }}
+    }
 
-    header p {{
+    header p {
       margin: 1rem auto 0;
       max-width: 60ch;
       color: #dce7ff;
-    }}
+    }
 
-    main {{
+    main {
       flex: 1 1 auto;
       width: min(900px, 92%);
       margin: -2.5rem auto 0;
-    }}
+    }
 
-    .search-card {{
+    .search-card {
       background: var(--card);
       border-radius: var(--radius);
       box-shadow: var(--shadow);
       padding: 2.2rem 2.4rem;
       display: grid;
       gap: 1.4rem;
-    }}
+    }
 
-    .search-card h2 {{
+    .search-card h2 {
       margin: 0;
       font-size: clamp(1.5rem, 1.4vw + 1rem, 2rem);
-    }}
+    }
 
-    .search-form {{
+    .search-form {
       display: grid;
       gap: 1rem;
-    }}
+    }
 
-    .search-fields {{
+    .search-fields {
       display: grid;
       gap: 0.75rem;
-    }}
+    }
 
-    @media (min-width: 640px) {{
-      .search-fields {{
+    @media (min-width: 640px) {
+      .search-fields {
         grid-template-columns: 1fr 1fr;
         gap: 0.85rem;
         align-items: center;
-      }}
-    }}
+      }
+    }
 
-    @media (min-width: 960px) {{
-      .search-fields {{
+    @media (min-width: 960px) {
+      .search-fields {
         grid-template-columns: 1.1fr 1fr 1fr;
-      }}
-    }}
+      }
+    }
 
-    .search-fields input {{
+    .search-fields input {
       border: 1px solid rgba(31, 41, 51, 0.1);
       border-radius: 999px;
       padding: 0.85rem 1.1rem;
       font-size: 1rem;
       width: 100%;
-    }}
+    }
 
-    .search-fields select {{
+    .search-fields select {
       border: 1px solid rgba(31, 41, 51, 0.12);
       border-radius: 999px;
       padding: 0.85rem 1.1rem;
       font-size: 1rem;
       width: 100%;
       background: #fff;
-    }}
+    }
 
-    .search-form button {{
+    .search-form button {
       justify-self: flex-start;
       border: none;
       border-radius: 999px;
@@ -185,20 +210,20 @@ def build_home_html(city_pages: list[tuple[str, str]]) -> str:
       font-weight: 600;
       cursor: pointer;
       transition: transform 0.2s ease, box-shadow 0.2s ease, background 0.2s ease;
-    }}
+    }
 
-    .search-form button:hover {{
+    .search-form button:hover {
       background: var(--accent-dark);
       transform: translateY(-2px);
       box-shadow: var(--shadow);
-    }}
+    }
 
-    footer {{
+    footer {
       padding: 2rem 0 2.5rem;
       text-align: center;
       color: var(--muted);
       font-size: 0.95rem;
-    }}
+    }
   </style>
 </head>
 <body>
@@ -207,21 +232,22 @@ def build_home_html(city_pages: list[tuple[str, str]]) -> str:
     <p>Explore in-demand roles across the Tar Heel State. Choose a city to see curated opportunities filtered from the latest Adzuna feed.</p>
   </header>
   <main>
-    <section class=\"search-card\">
+    <section class="search-card">
       <h2>Search openings by city</h2>
-      <form class=\"search-form\" id=\"city-form\">
-        <div class=\"search-fields\">
-          <label class=\"visually-hidden\" for=\"city-search\">Filter cities</label>
-          <input id=\"city-search\" type=\"search\" placeholder=\"Start typing a city...\" autocomplete=\"off\" />
-          <label class=\"visually-hidden\" for=\"keyword-search\">Keyword or skill (optional)</label>
-          <input id=\"keyword-search\" type=\"search\" placeholder=\"Keyword or skill (optional)\" autocomplete=\"off\" />
-          <label class=\"visually-hidden\" for=\"city-select\">Choose a city</label>
-          <select id=\"city-select\" required>
-            <option value=\"\" disabled selected>Select a city</option>
-{options_html}
-          </select>
+      <form class="search-form" id="city-form">
+        <div class="search-fields">
+          <label class="visually-hidden" for="city-search">Filter cities</label>
+          <input id="city-search" type="search" placeholder="Start typing a city..." autocomplete="off" />
+          <label class="visually-hidden" for="keyword-search">Keyword or skill (optional)</label>
+          <input id="keyword-search" type="search" placeholder="Keyword or skill (optional)" autocomplete="off" />
+          <label class="visually-hidden" for="city-select">Choose a city</label>
+          <select id="city-select" required>
+            <option value="" disabled selected>Select a city</option>
+"""
+
+_HTML_SUFFIX = """          </select>
         </div>
-        <button type=\"submit\">View city insights</button>
+        <button type="submit">View city insights</button>
       </form>
     </section>
   </main>
@@ -230,7 +256,7 @@ def build_home_html(city_pages: list[tuple[str, str]]) -> str:
   </footer>
 
   <style>
-    .visually-hidden {{
+    .visually-hidden {
       position: absolute;
       width: 1px;
       height: 1px;
@@ -240,7 +266,7 @@ def build_home_html(city_pages: list[tuple[str, str]]) -> str:
       clip: rect(0, 0, 0, 0);
       white-space: nowrap;
       border: 0;
-    }}
+    }
   </style>
   <script>
     const searchInput = document.getElementById('city-search');
@@ -248,50 +274,98 @@ def build_home_html(city_pages: list[tuple[str, str]]) -> str:
     const citySelect = document.getElementById('city-select');
     const form = document.getElementById('city-form');
 
-    if (searchInput && citySelect) {{
-      searchInput.addEventListener('input', () => {{
+    if (searchInput && citySelect) {
+      searchInput.addEventListener('input', () => {
         const term = searchInput.value.trim().toLowerCase();
         let firstVisible = null;
-        Array.from(citySelect.options).forEach(option => {{
+        Array.from(citySelect.options).forEach(option => {
           if (!option.value) return;
           const match = option.text.toLowerCase().includes(term);
           option.hidden = !match;
-          if (match && !firstVisible) {{
+          if (match && !firstVisible) {
             firstVisible = option;
-          }}
-        }});
-        if (firstVisible) {{
+          }
+        });
+        if (firstVisible) {
           citySelect.value = firstVisible.value;
-        }} else {{
+        } else {
           citySelect.value = '';
-        }}
-      }});
-    }}
+        }
+      });
+    }
 
-    if (form && citySelect) {{
-      form.addEventListener('submit', event => {{
+    if (form && citySelect) {
+      form.addEventListener('submit', event => {
         event.preventDefault();
         let destination = citySelect.value;
         if (!destination) return;
 
         const keyword = keywordInput ? keywordInput.value.trim() : '';
-        if (keyword) {{
+        if (keyword) {
           const joiner = destination.includes('?') ? '&' : '?';
           destination += joiner + 'q=' + encodeURIComponent(keyword);
-        }}
+        }
         window.location.href = destination;
-      }});
-    }}
+      });
+    }
   </script>
 </body>
 </html>
 """
 
 
+# The template is pure ASCII, so encode it once at import and write bytes
+# straight through instead of re-encoding the whole document on every run.
+_HTML_PREFIX_BYTES = _HTML_PREFIX.encode("utf-8")
+_HTML_SUFFIX_BYTES = _HTML_SUFFIX.encode("utf-8")
+
+# The no-cities document never varies, so build it once at import.
+_EMPTY_OPTIONS_HTML = '          <option value="" disabled>No city pages found</option>\n'
+_HOME_EMPTY_DOC = _HTML_PREFIX + _EMPTY_OPTIONS_HTML + _HTML_SUFFIX
+_HOME_EMPTY_DOC_BYTES = _HOME_EMPTY_DOC.encode("utf-8")
+
+_HTML_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;",
+})
+
+
+def _esc(text: str) -> str:
+    """Escape HTML special characters in one translate pass."""
+    return text.translate(_HTML_ESCAPE_TABLE)
+
+
+def build_home_html(city_pages: list[tuple[str, str]]) -> str:
+    """Produce the home page HTML string."""
+    if not city_pages:
+        return _HOME_EMPTY_DOC
+    esc = _esc
+    options_html = "".join(
+        [f'          <option value="{esc(path)}">{esc(label)}</option>\n' for label, path in city_pages]
+    )
+    return "".join((_HTML_PREFIX, options_html, _HTML_SUFFIX))
+
+
+def write_home_html(city_pages: list[tuple[str, str]], fp) -> None:
+    """Write the home page for city_pages to the open binary file fp."""
+    if not city_pages:
+        fp.write(_HOME_EMPTY_DOC_BYTES)
+        return
+    fp.write(_HTML_PREFIX_BYTES)
+    esc = _esc
+    write = fp.write
+    for label, path in city_pages:
+        write(f'          <option value="{esc(path)}">{esc(label)}</option>\n'.encode("utf-8"))
+    fp.write(_HTML_SUFFIX_BYTES)
+
+
 def main() -> None:
     city_pages = discover_city_pages()
-    html_doc = build_home_html(city_pages)
-    OUTPUT_FILE.write_text(html_doc, encoding="utf-8")
+    with OUTPUT_FILE.open("wb") as fp:
+        write_home_html(city_pages, fp)
     print(f"✅ Wrote home page to '{OUTPUT_FILE}'.")
 
 